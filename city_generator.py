@@ -0,0 +1,324 @@
+import threading
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection
+
+from city_kernels import FREE, cell_insert, find_candidate, find_grid_candidate, rebuild_cells
+
+_DIAG = np.sqrt(0.5)
+COMPASS_COS = np.array([1.0, _DIAG, 0.0, -_DIAG, -1.0, -_DIAG, 0.0, _DIAG])  # Counter-clockwise from E
+COMPASS_SIN = np.array([0.0, _DIAG, 1.0, _DIAG, 0.0, -_DIAG, -1.0, -_DIAG])
+
+ANGLE_POLICIES = ('cardinal', 'compass', 'uniform')
+
+
+class InfiniteCityGenerator:
+    # angle_policy picks road directions: 'cardinal' (N/S/E/W plus a little
+    # noise), 'compass' (mostly cardinal, some diagonal) or 'uniform' (any
+    # angle). snap_to_grid places nodes on a min_distance grid.
+    def __init__(self, angle_policy='uniform', snap_to_grid=False):
+        if angle_policy not in ANGLE_POLICIES:
+            raise ValueError(f"angle_policy must be one of {ANGLE_POLICIES}, got {angle_policy!r}")
+        self.angle_policy = angle_policy
+        self.snap_to_grid = snap_to_grid
+        self._pos = np.empty((1024, 2), dtype=np.float32)  # (capacity, 2), doubled when full
+        self.n_nodes = 0
+        self._xmin = self._ymin = np.inf  # Running bounds for the viewport
+        self._xmax = self._ymax = -np.inf
+        self._edge_set = set()  # min << 32 | max per road, for dedup only
+        self._edge_u = np.empty(1024, dtype=np.int32)
+        self._edge_v = np.empty(1024, dtype=np.int32)
+        self._edge_t = np.empty(1024, dtype=np.int32)  # current_time when added
+        self._segments = np.empty((1024, 2, 2), dtype=np.float32)  # (E, 2, 2) road endpoints
+        self.n_edges = 0
+        self._queue = np.empty(1 << 16, dtype=np.int32)  # Ring buffer of nodes to grow from
+        self._q_head = 0
+        self._q_tail = 0
+        self._q_size = 0
+        self.current_time = 0
+        self.min_distance = 0.03
+        self.min_valid_sq = self.min_distance ** 2
+        self.cell_size = self.min_distance  # find_grid_candidate relies on cells matching the grid
+        self.cell_head = np.full(1 << 16, -1, dtype=np.int32)  # hashed cell -> newest node id
+        self.cell_next = np.empty(1024, dtype=np.int32)  # node id -> previous node in its cell
+        self.rng = np.random.default_rng()
+
+        self.fig, self.ax = plt.subplots(figsize=(10, 10), facecolor='black')
+        self._blit = self.fig.canvas.supports_blit
+        self.ax.set_facecolor((0.01, 0.02, 0.02, 0.05))
+        self.ax.axis('off')
+        self._stats_text = self.ax.text(0.02, 0.98, "", transform=self.ax.transAxes,
+                                        color='white', fontsize=10, verticalalignment='top',
+                                        bbox=dict(facecolor='black', alpha=0.5, edgecolor='none'),
+                                        animated=self._blit)
+
+        self.cmap = LinearSegmentedColormap.from_list(
+            'road_age', ['green', 'yellow', 'orange', 'red'])
+
+        self._add_node((0.0, 0.0))
+
+        self.lc_main = None
+        self._rendered_edges = 0
+
+        # Blitting: roads and stats are animated artists, so a full draw only
+        # paints the empty axes, which is cached and restored under each frame.
+        # Any full draw (limit change, window resize) recaptures it.
+        self._bg = None
+        self._view_limits = None
+        self._draw_cid = self.fig.canvas.mpl_connect('draw_event', self._on_draw) if self._blit else None
+
+        # Growth runs on a background thread; the lock is held per batch so a
+        # render snapshot never sees a half-resized set of arrays
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sim_thread = None
+
+    @property
+    def pos_xy(self):
+        return self._pos[:self.n_nodes]
+
+    def _find_candidate(self, base_pos, c, s):
+        if self.snap_to_grid:
+            return find_grid_candidate(float(base_pos[0]), float(base_pos[1]), c, s, self._pos, self.cell_head,
+                                       self.cell_next, self.cell_size)
+        return find_candidate(float(base_pos[0]), float(base_pos[1]), c, s, self.min_distance, 5,
+                              self.min_valid_sq, self._pos, self.cell_head, self.cell_next, self.cell_size)
+
+    def _enqueue(self, node_id):
+        if self._q_size == len(self._queue):
+            # Full ring: head == tail, so unroll it in order into a buffer twice the size
+            self._queue = np.concatenate((self._queue[self._q_head:], self._queue[:self._q_head],
+                                          np.empty(len(self._queue), dtype=np.int32)))
+            self._q_head = 0
+            self._q_tail = self._q_size
+        self._queue[self._q_tail] = node_id
+        self._q_tail = (self._q_tail + 1) & (len(self._queue) - 1)
+        self._q_size += 1
+
+    def _dequeue(self):
+        node_id = int(self._queue[self._q_head])
+        self._q_head = (self._q_head + 1) & (len(self._queue) - 1)
+        self._q_size -= 1
+        return node_id
+
+    def _add_node(self, pos):
+        # pos comes straight from _find_candidate, which already checked spacing
+        node_id = self.n_nodes
+        if node_id == len(self._pos):
+            self._pos = np.resize(self._pos, (2 * len(self._pos), 2))
+            self.cell_next = np.resize(self.cell_next, len(self._pos))
+        self._pos[node_id] = pos
+        self.n_nodes += 1
+        x, y = pos
+        if x < self._xmin:
+            self._xmin = x
+        if x > self._xmax:
+            self._xmax = x
+        if y < self._ymin:
+            self._ymin = y
+        if y > self._ymax:
+            self._ymax = y
+        cell_insert(node_id, self._pos, self.cell_head, self.cell_next, self.cell_size)
+        if self.n_nodes > len(self.cell_head):
+            # Keep buckets short: grow the table and rehash every node
+            self.cell_head = np.empty(2 * len(self.cell_head), dtype=np.int32)
+            rebuild_cells(self._pos, self.n_nodes, self.cell_head, self.cell_next, self.cell_size)
+        self._enqueue(node_id)
+
+        return node_id
+
+    def _add_road(self, node1, node2):
+        if node1 == node2:
+            return
+        a, b = (node1, node2) if node1 < node2 else (node2, node1)
+        key = (int(a) << 32) | int(b)
+        if key in self._edge_set:
+            return
+        self._edge_set.add(key)
+
+        edge_id = self.n_edges
+        if edge_id == len(self._edge_t):
+            capacity = 2 * len(self._edge_t)
+            self._edge_u = np.resize(self._edge_u, capacity)
+            self._edge_v = np.resize(self._edge_v, capacity)
+            self._edge_t = np.resize(self._edge_t, capacity)
+            self._segments = np.resize(self._segments, (capacity, 2, 2))
+        self._edge_u[edge_id] = a
+        self._edge_v[edge_id] = b
+        self._segments[edge_id, 0] = self._pos[a]
+        self._segments[edge_id, 1] = self._pos[b]
+        self._edge_t[edge_id] = self.current_time
+        self.n_edges += 1
+
+    def _draw_directions(self, size):
+        if self.angle_policy == 'cardinal':
+            return self._draw_cardinal_directions(size)
+        if self.angle_policy == 'compass':
+            return self._draw_compass_directions(size)
+        angles = self.rng.uniform(0, 2 * np.pi, size)
+        return np.cos(angles), np.sin(angles)
+
+    def _draw_cardinal_directions(self, size):
+        # Cardinal angle plus a small deviation
+        angles = self.rng.integers(0, 4, size) * (np.pi / 2) + self.rng.normal(0, np.pi / 16, size)
+        return np.cos(angles), np.sin(angles)
+
+    def _draw_compass_directions(self, size):
+        # Only the 8 compass directions are used, so look them up instead of
+        # evaluating trig: even table entries are cardinal, odd are diagonal
+        cardinal = 2 * self.rng.integers(0, 4, size)
+        diagonal = cardinal + 1
+        idx = np.where(self.rng.random(size) < 0.8, cardinal, diagonal)
+        return COMPASS_COS[idx], COMPASS_SIN[idx]
+
+    def grow_city_batch(self, n):
+        # All randomness for the batch is drawn up front: 1-3 roads per step,
+        # and one direction per road, laid out back to back
+        n_roads = self.rng.integers(1, 4, size=n)
+        ends = np.cumsum(n_roads)
+        cos_a, sin_a = self._draw_directions(int(ends[-1]) if n else 0)
+        cos_a = cos_a.tolist()
+        sin_a = sin_a.tolist()
+
+        for start, end in zip((ends - n_roads).tolist(), ends.tolist()):
+            if not self._q_size:
+                if self.n_nodes:
+                    self._enqueue(self.rng.integers(0, self.n_nodes))
+                continue
+
+            self.current_time += 1
+            node_id = self._dequeue()
+            pos = self._pos[node_id]
+
+            for k in range(start, end):
+                status, x, y = self._find_candidate(pos, cos_a[k], sin_a[k])
+                if status == FREE:
+                    self._add_road(node_id, self._add_node((x, y)))
+
+    def build_road_graph(self):
+        # Built on demand only; growth and rendering work off the arrays, so
+        # networkx is only needed by callers that want the graph
+        import networkx as nx
+
+        n = self.n_edges
+        graph = nx.Graph()
+        graph.add_nodes_from((i, {'pos': tuple(p)}) for i, p in enumerate(self.pos_xy.tolist()))
+        graph.add_edges_from(zip(self._edge_u[:n].tolist(), self._edge_v[:n].tolist()))
+        return graph
+
+    def start_simulation(self, batch_size, interval=0.0):
+        self._stop.clear()
+        self._sim_thread = threading.Thread(target=self._simulate, args=(batch_size, interval), daemon=True)
+        self._sim_thread.start()
+
+    def _simulate(self, batch_size, interval):
+        while not self._stop.wait(interval):
+            with self.lock:
+                self.grow_city_batch(batch_size)
+
+    def stop_simulation(self):
+        self._stop.set()
+        if self._sim_thread is not None:
+            self._sim_thread.join()
+            self._sim_thread = None
+
+    def optimized_render(self):
+        # Snapshot counts and array views; growth only ever writes past them
+        with self.lock:
+            n = self.n_edges
+            n_nodes = self.n_nodes
+            current_time = self.current_time
+            edge_t = self._edge_t[:n]
+            segments = self._segments[:n]
+            xmin, xmax, ymin, ymax = self._xmin, self._xmax, self._ymin, self._ymax
+
+        # Normalized age per road; the collection applies the colormap itself
+        norm_age = np.minimum(current_time - edge_t, 50) / 50.0
+
+        # Roads are append-only, so segments only need pushing when new ones arrived
+        if self.lc_main is None:
+            self.lc_main = LineCollection(segments, cmap=self.cmap, norm=plt.Normalize(0, 1),
+                                          linewidths=1.5, alpha=0.9, capstyle='round', animated=self._blit)
+            self.ax.add_collection(self.lc_main)
+            self._rendered_edges = n
+        elif n != self._rendered_edges:
+            self.lc_main.set_segments(segments)
+            self._rendered_edges = n
+
+        self.lc_main.set_array(norm_age)
+
+        self._stats_text.set_text(f"Roads: {n}\nNodes: {n_nodes}")
+
+        canvas = self.fig.canvas
+        view = self._view_limits
+        if view is None or xmin - 0.1 < view[0] or xmax + 0.1 > view[1] or ymin - 0.1 < view[2] \
+                or ymax + 0.1 > view[3]:
+            # City outgrew the view: widen it with 10% headroom so the cached
+            # background (which holds the old limits) is only redrawn now and then
+            pad_x = 0.1 + 0.1 * (xmax - xmin)
+            pad_y = 0.1 + 0.1 * (ymax - ymin)
+            self._view_limits = (xmin - pad_x, xmax + pad_x, ymin - pad_y, ymax + pad_y)
+            self.ax.set_xlim(self._view_limits[0], self._view_limits[1])
+            self.ax.set_ylim(self._view_limits[2], self._view_limits[3])
+            self._bg = None
+
+        if not self._blit:
+            canvas.draw_idle()
+        elif self._bg is None:
+            canvas.draw()  # _on_draw captures the background and paints the artists
+            canvas.blit(self.fig.bbox)
+        else:
+            canvas.restore_region(self._bg)
+            self._draw_animated()
+            canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+    def _draw_animated(self):
+        if self.lc_main is not None:
+            self.ax.draw_artist(self.lc_main)
+        self.ax.draw_artist(self._stats_text)
+
+    def _on_draw(self, event):
+        self._bg = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def save_image(self, path):
+        # savefig skips animated artists, so put them back in the normal draw
+        if self._draw_cid is not None:
+            self.fig.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        for artist in (self.lc_main, self._stats_text):
+            if artist is not None:
+                artist.set_animated(False)
+        self.fig.savefig(path, dpi=300, bbox_inches='tight', facecolor='black')
+
+
+def run(message, output_path, steps_per_tick=15, **generator_kwargs):
+    # Shared entry point for the style scripts: grow and render until Ctrl+C,
+    # then save the city to output_path
+    print(f"{message} Press Ctrl+C to stop")
+    plt.ion()
+    generator = InfiniteCityGenerator(**generator_kwargs)
+    plt.show(block=False)
+    generator.start_simulation(steps_per_tick, interval=0.005)
+    frame_budget = 1 / 30
+
+    try:
+        while True:
+            frame_start = time.perf_counter()
+            generator.optimized_render()
+            # Hand the rest of the frame budget to the GUI event loop; unlike
+            # plt.pause this never triggers a full redraw of the stale figure
+            idle = frame_budget - (time.perf_counter() - frame_start)
+            if idle > 0:
+                generator.fig.canvas.start_event_loop(idle)
+
+    except KeyboardInterrupt:
+        generator.stop_simulation()
+        print("\nSimulation ended.")
+        print(f"Final stats: Roads={generator.n_edges}, Nodes={generator.n_nodes}")
+        generator.save_image(output_path)
+        plt.close()
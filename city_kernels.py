@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Run the same kernels as plain Python without Numba
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# find_candidate outcomes
+FREE = 0
+REJECT = 1
+
+# Cell hash: heads[h] is the newest node in bucket h and nexts[node] the one
+# inserted before it, so each bucket is a linked list threaded through nexts.
+# Cells are centered on multiples of cell_size, so a node snapped to a grid of
+# the same spacing always lands in its own grid point's cell.
+
+@njit(cache=True, nogil=True)
+def cell_of(v, cell_size):
+    """Cell index along one axis"""
+    return math.floor(v / cell_size + 0.5)
+
+
+@njit(cache=True, nogil=True)
+def cell_hash(ix, iy, mask):
+    """Bucket index of grid cell (ix, iy)"""
+    return ((ix * 73856093) ^ (iy * 19349663)) & mask
+
+
+@njit(cache=True, nogil=True)
+def cell_insert(node_id, pos, cell_head, cell_next, cell_size):
+    """Push node_id onto the bucket list of the cell containing pos[node_id]"""
+    h = cell_hash(cell_of(pos[node_id, 0], cell_size), cell_of(pos[node_id, 1], cell_size), len(cell_head) - 1)
+    cell_next[node_id] = cell_head[h]
+    cell_head[h] = node_id
+
+
+@njit(cache=True, nogil=True)
+def rebuild_cells(pos, n_nodes, cell_head, cell_next, cell_size):
+    """Re-insert the first n_nodes positions after the bucket table was resized"""
+    cell_head[:] = -1
+    for i in range(n_nodes):
+        cell_insert(i, pos, cell_head, cell_next, cell_size)
+
+
+@njit(cache=True, nogil=True)
+def nearest_node(x, y, pos, cell_head, cell_next, cell_size):
+    """Closest node to (x, y) among the 3x3 neighboring cells, as (idx, dist_sq)"""
+    mask = len(cell_head) - 1
+    cx = cell_of(x, cell_size)
+    cy = cell_of(y, cell_size)
+    best_idx = -1
+    best_dist_sq = np.inf
+    for ix in range(cx - 1, cx + 2):
+        for iy in range(cy - 1, cy + 2):
+            j = cell_head[cell_hash(ix, iy, mask)]
+            while j != -1:
+                dx = pos[j, 0] - x
+                dy = pos[j, 1] - y
+                dist_sq = dx * dx + dy * dy
+                if dist_sq < best_dist_sq:
+                    best_idx = j
+                    best_dist_sq = dist_sq
+                j = cell_next[j]
+    return best_idx, best_dist_sq
+
+
+@njit(cache=True, nogil=True)
+def find_candidate(base_x, base_y, c, s, min_d, n_steps, min_valid_sq,
+                   pos, cell_head, cell_next, cell_size):
+    """Walk outward from base along direction (c, s) in a single neighbor scan per step.
+
+    Returns (status, x, y). Candidates sit at n_steps distances from min_d
+    to 2 * min_d. Candidates closer than sqrt(min_valid_sq) to a node are
+    skipped; the first one at least that far from every node is FREE and
+    already validated, so it can be added as is. REJECT if none is. Grid
+    snapped cities use find_grid_candidate instead.
+    """
+    for k in range(n_steps):
+        d = min_d * (1.0 + k / (n_steps - 1))
+        x = base_x + d * c
+        y = base_y + d * s
+        _, dist_sq = nearest_node(x, y, pos, cell_head, cell_next, cell_size)
+        if dist_sq >= min_valid_sq:
+            return FREE, x, y
+    return REJECT, 0.0, 0.0
+
+
+@njit(cache=True, nogil=True)
+def find_grid_candidate(base_x, base_y, c, s, pos, cell_head, cell_next, cell_size):
+    """find_candidate for cities snapped to a grid of spacing cell_size.
+
+    Every node sits on a grid point, so a snapped candidate is either
+    occupied or at least one grid step from every node: one bucket walk per
+    candidate decides it, with no distance sweep or 3x3 scan. Candidates
+    are the grid points the 1, 1.5 and 2 step distances along (c, s) snap
+    to, tried in that order; REJECT if all are occupied.
+    """
+    gx = cell_of(base_x, cell_size)
+    gy = cell_of(base_y, cell_size)
+    mask = len(cell_head) - 1
+    for k in (1.0, 1.5, 2.0):
+        tx = gx + round(k * c)
+        ty = gy + round(k * s)
+        occupied = False
+        j = cell_head[cell_hash(tx, ty, mask)]
+        while j != -1:
+            if cell_of(pos[j, 0], cell_size) == tx and cell_of(pos[j, 1], cell_size) == ty:
+                occupied = True
+                break
+            j = cell_next[j]
+        if not occupied:
+            return FREE, tx * cell_size, ty * cell_size
+    return REJECT, 0.0, 0.0